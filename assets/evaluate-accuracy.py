@@ -7,11 +7,23 @@ Constraint violations (latency limits, memory, etc.) should be printed as
 regular messages - Weco will see them and avoid solutions that violate constraints.
 """
 import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
 
 
 def load_module(path):
-    spec = importlib.util.spec_from_file_location("mod", path)
+    """Import a file as a module named after its stem (e.g. "optimize").
+
+    Registering it in sys.modules lets pickle and dataclasses resolve objects
+    defined in the file. The source loader reuses __pycache__ bytecode, so an
+    unchanged file is not re-parsed on later Weco steps.
+    """
+    name = Path(path).stem
+    spec = importlib.util.spec_from_file_location(name, path)
     mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
     spec.loader.exec_module(mod)
     return mod
 
@@ -47,6 +59,10 @@ optimized = load_module(".weco/optimize.py")
 X_test = None
 y_test = None
 
+# Hold labels in a contiguous ndarray so scoring is one vectorized comparison,
+# even when the dataset yields Python lists (e.g. Hugging Face columns)
+y_test = np.ascontiguousarray(y_test)
+
 # =============================================================================
 # CONSTRAINT CHECKS (print violations, don't use as metrics)
 # =============================================================================
@@ -62,8 +78,10 @@ y_test = None
 # =============================================================================
 # ACCURACY MEASUREMENT (the single metric to optimize)
 # =============================================================================
+# Predict on the whole test set in one call: predict() should take the full
+# batch and return an array, not be called once per sample in a Python loop.
 # TODO: Replace with your prediction function
-predictions = optimized.predict(X_test)
-accuracy = (predictions == y_test).mean()
+predictions = np.asarray(optimized.predict(X_test))
+accuracy = float(np.mean(predictions == y_test))
 
 print(f"accuracy: {accuracy:.4f}")
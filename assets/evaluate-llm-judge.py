@@ -12,6 +12,10 @@ IMPORTANT: API key (ANTHROPIC_API_KEY or OPENAI_API_KEY) must be available
 via .env file or environment variable. The agent must never read, check,
 or handle API keys directly.
 
+Set WECO_LLM_CACHE=1 to reuse identical execution/judge calls across Weco
+steps from an on-disk cache. Leave it unset when measuring baseline variance:
+cached runs repeat the same responses and report zero variance.
+
 IMPORTANT: Run the environment pre-flight before first use:
 1. Create a venv: python -m venv .venv && source .venv/bin/activate
 2. Install deps: pip install anthropic python-dotenv  (or: pip install openai python-dotenv)
@@ -19,8 +23,16 @@ IMPORTANT: Run the environment pre-flight before first use:
 4. Dry-run: bash evaluate.sh
 See SKILL.md "Environment Pre-flight" for the full checklist.
 """
+import contextlib
+import functools
+import hashlib
 import json
+import os
+import re
+import statistics
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Load API keys from .env file if present
@@ -30,12 +42,39 @@ try:
 except ImportError:
     pass
 
+# Parse judge output with orjson when installed: faster, and strict about
+# malformed JSON. orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # =============================================================================
 # PROVIDER CONFIGURATION — set to "anthropic" or "openai"
 # =============================================================================
 
 PROVIDER = "anthropic"
 
+# Import the SDK once at module load rather than inside every request. A
+# missing package is raised from get_client() instead, so validate_models()
+# reports it and the script still prints its metric line.
+_sdk_import_error = None
+try:
+    if PROVIDER == "anthropic":
+        from anthropic import Anthropic, DefaultHttpxClient
+    elif PROVIDER == "openai":
+        from openai import OpenAI, DefaultHttpxClient
+except ImportError as e:
+    _sdk_import_error = e
+
+# Multiplex concurrent requests over one HTTP/2 connection when httpx's
+# optional h2 dependency is installed (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
 # =============================================================================
 # MODEL CONFIGURATION
 # =============================================================================
@@ -45,57 +84,207 @@ PROVIDER = "anthropic"
 # Model for executing the prompt being optimized
 EXECUTION_MODEL = "claude-sonnet-4-5"
 
-# Model for judging responses (use a capable model)
-JUDGE_MODEL = "claude-sonnet-4-5"
+# Model for judging responses. A fast model averaged over several votes is
+# cheaper than one call to a large model and has lower variance on a 1-5 scale.
+JUDGE_MODEL = "claude-haiku-4-5"
+
+# Independent judge calls per response, run in parallel and averaged
+JUDGE_VOTES = 3
+
+# Responses judged per judge call. 1 = one call per scenario. Larger values
+# send the rubric once for several responses (fewer calls, fewer input
+# tokens), at the cost of the judge seeing responses side by side. Batches
+# are judged with a single vote.
+JUDGE_BATCH_SIZE = 1
 
 # All models used in this script (for validation)
 ALL_MODELS = list(set([EXECUTION_MODEL, JUDGE_MODEL]))
 
+# Output token caps. Keep them close to real output lengths: the judge only
+# returns a short JSON object. Scenarios can override MAX_EXEC_TOKENS with a
+# "max_tokens" key when they expect longer responses.
+MAX_EXEC_TOKENS = 1024
+MAX_JUDGE_TOKENS = 300
+
+# Maximum API requests in flight across executions and judge votes
+# (bounded by provider rate limits)
+MAX_CONCURRENCY = 16
+
+# Per-request timeout (seconds) and SDK retry count for the shared client.
+# The SDK retries rate limits, overload and connection errors with
+# exponential backoff, so transient failures do not end up as scores.
+API_TIMEOUT = 60.0
+API_MAX_RETRIES = 5
+
 
 # =============================================================================
 # PROVIDER ABSTRACTION
 # =============================================================================
 
-def chat(model, messages, system=None, max_tokens=1024):
-    """Send a chat request to the configured provider."""
-    if PROVIDER == "anthropic":
-        from anthropic import Anthropic
-        client = Anthropic()
-        kwargs = {"model": model, "max_tokens": max_tokens, "messages": messages}
-        if system:
-            kwargs["system"] = system
-        response = client.messages.create(**kwargs)
-        return response.content[0].text
-    elif PROVIDER == "openai":
-        from openai import OpenAI
-        client = OpenAI()
-        full_messages = []
-        if system:
-            full_messages.append({"role": "system", "content": system})
-        full_messages.extend(messages)
-        response = client.chat.completions.create(
-            model=model, max_tokens=max_tokens, messages=full_messages,
-        )
-        return response.choices[0].message.content
-    else:
-        raise ValueError(f"Unknown provider: {PROVIDER}")
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared provider client, creating it on first use.
+
+    Creation is deferred so a missing API key is reported by validate_models()
+    instead of crashing at import time.
+
+    SDK clients are thread-safe and keep a connection pool, so one client is
+    reused by every scenario instead of paying TLS setup per request.
+    """
+    global _client
+    if _sdk_import_error is not None:
+        raise _sdk_import_error
+    with _client_lock:
+        if _client is None:
+            if PROVIDER == "anthropic":
+                _client = Anthropic(
+                    max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                    http_client=DefaultHttpxClient(http2=True) if HTTP2 else None,
+                )
+            elif PROVIDER == "openai":
+                _client = OpenAI(
+                    max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                    http_client=DefaultHttpxClient(http2=True) if HTTP2 else None,
+                )
+            else:
+                raise ValueError(f"Unknown provider: {PROVIDER}")
+        return _client
+
+
+# Held for the duration of every API call, so the nested execution, judge
+# and vote pools never have more than MAX_CONCURRENCY requests in flight
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+
+
+def chat(model, messages, system=None, max_tokens=1024, cache_system=False,
+         stream=False, warn_truncation=False):
+    """Send a chat request to the configured provider.
+
+    stream=True receives the response incrementally, which keeps long
+    generations clear of idle-connection timeouts; the full text is returned
+    either way.
+
+    warn_truncation=True logs to stderr when the response stops at
+    max_tokens, since the judge would otherwise score a cut-off answer
+    without comment.
+
+    cache_system=True marks the system prompt for Anthropic prompt caching,
+    so repeated prefixes are billed and processed at the cached rate. Prompts
+    below Anthropic's minimum cacheable length (~1024 tokens) are simply sent
+    uncached. OpenAI caches long shared prefixes automatically and ignores
+    the flag.
+    """
+    with _request_slots:
+        if PROVIDER == "anthropic":
+            client = get_client()
+            kwargs = {"model": model, "max_tokens": max_tokens, "messages": messages}
+            if system and cache_system:
+                kwargs["system"] = [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]
+            elif system:
+                kwargs["system"] = system
+            if stream:
+                with client.messages.stream(**kwargs) as response_stream:
+                    response = response_stream.get_final_message()
+            else:
+                response = client.messages.create(**kwargs)
+            if warn_truncation and response.stop_reason == "max_tokens":
+                warn_truncated(model, max_tokens)
+            return "".join(block.text for block in response.content if block.type == "text")
+        elif PROVIDER == "openai":
+            client = get_client()
+            full_messages = []
+            if system:
+                full_messages.append({"role": "system", "content": system})
+            full_messages.extend(messages)
+            if stream:
+                chunks = client.chat.completions.create(
+                    model=model, max_tokens=max_tokens, messages=full_messages, stream=True,
+                )
+                parts, finish_reason = [], None
+                for chunk in chunks:
+                    if chunk.choices:
+                        parts.append(chunk.choices[0].delta.content or "")
+                        finish_reason = chunk.choices[0].finish_reason or finish_reason
+                text = "".join(parts)
+            else:
+                response = client.chat.completions.create(
+                    model=model, max_tokens=max_tokens, messages=full_messages,
+                )
+                finish_reason = response.choices[0].finish_reason
+                text = response.choices[0].message.content
+            if warn_truncation and finish_reason == "length":
+                warn_truncated(model, max_tokens)
+            return text
+        else:
+            raise ValueError(f"Unknown provider: {PROVIDER}")
+
+
+def warn_truncated(model, max_tokens):
+    """Log a response that stopped at its max_tokens cap."""
+    print(f"Warning: {model} response truncated at max_tokens={max_tokens}; "
+          "raise MAX_EXEC_TOKENS or set the scenario's \"max_tokens\"",
+          file=sys.stderr)
+
+
+def is_transient_error(e):
+    """True for rate-limit (429), overload (529), server and connection errors.
+
+    The SDK client already retries these API_MAX_RETRIES times with
+    exponential backoff, so one that still fails says nothing about the
+    artifact being evaluated.
+    """
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(e).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class IncompleteEvaluation(RuntimeError):
+    """Some scenarios were lost to transient API errors, so there is no score."""
+
+
+def failure_score(label, e):
+    """Score for a failed scenario: None (lost) if transient, else 1.0.
+
+    A lost scenario invalidates the whole run: averaging over the remaining
+    subset would make this step's metric incomparable with other steps.
+    """
+    if is_transient_error(e):
+        print(f"Skipping {label}: API unavailable after retries: {e}")
+        return None
+    print(f"Error in {label}: {e}")
+    return 1.0  # Penalize failures
 
 
 # =============================================================================
 # MODEL VALIDATION
 # =============================================================================
 
+def _ping_one(model_id):
+    """Send a one-token request to a model. Returns (model_id, ok, error)."""
+    try:
+        chat(model_id, [{"role": "user", "content": "hi"}], max_tokens=1)
+        print(f"  ok: {model_id}", file=sys.stderr)
+        return model_id, True, None
+    except Exception as e:
+        print(f"  FAILED: {model_id} - {e}", file=sys.stderr)
+        return model_id, False, e
+
+
 def validate_models():
-    """Smoke test that all configured models are available."""
-    all_ok = True
-    for model_id in ALL_MODELS:
-        try:
-            chat(model_id, [{"role": "user", "content": "hi"}], max_tokens=1)
-            print(f"  ok: {model_id}", file=sys.stderr)
-        except Exception as e:
-            print(f"  FAILED: {model_id} - {e}", file=sys.stderr)
-            all_ok = False
-    return all_ok
+    """Smoke test that all configured models are available.
+
+    Models are pinged concurrently, so startup waits for the slowest model
+    rather than the sum of all of them.
+    """
+    with ThreadPoolExecutor(max_workers=len(ALL_MODELS)) as executor:
+        results = list(executor.map(_ping_one, ALL_MODELS))
+    return all(ok for _, ok, _ in results)
 
 
 # =============================================================================
@@ -107,15 +296,61 @@ def validate_models():
 # or any other location — it always looks for optimize.txt alongside itself.
 SCRIPT_DIR = Path(__file__).parent
 
+@functools.lru_cache(maxsize=4)
+def _read_artifact(path, mtime_ns):
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
 def load_artifact(path):
-    with open(path) as f:
-        return f.read()
+    """Read an artifact, reusing the cached text until the file changes."""
+    return _read_artifact(str(path), os.stat(path).st_mtime_ns)
 
 
 # The prompt/skill being optimized (same directory as this script)
 optimized = load_artifact(SCRIPT_DIR / "optimize.txt")
 
 
+# =============================================================================
+# RESPONSE CACHE (opt-in via WECO_LLM_CACHE=1)
+# =============================================================================
+# Weco re-runs this script every step, but most (prompt, scenario) pairs and
+# most judged responses are unchanged between steps. Identical requests are
+# served from disk instead of paying for the same API call again.
+
+CACHE_ENABLED = os.environ.get("WECO_LLM_CACHE") == "1"
+CACHE_DIR = SCRIPT_DIR / ".cache"
+
+
+def cached_chat(model, messages, cache_tag=None, **kwargs):
+    """chat() backed by an on-disk cache keyed on the full request.
+
+    cache_tag is added to the key (not sent), so deliberately repeated
+    requests such as independent judge votes each get their own entry.
+    """
+    if not CACHE_ENABLED:
+        return chat(model, messages, **kwargs)
+
+    key = [PROVIDER, model, messages, kwargs]
+    if cache_tag is not None:
+        key.append(cache_tag)
+    request = json.dumps(key, sort_keys=True)
+    path = CACHE_DIR / f"{hashlib.sha256(request.encode()).hexdigest()}.json"
+    try:
+        return json.loads(path.read_text())["text"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    text = chat(model, messages, **kwargs)
+
+    # Write atomically so concurrent scenarios never read a partial entry
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps({"text": text}))
+    os.replace(tmp, path)
+    return text
+
+
 # =============================================================================
 # TRAINING SCENARIOS - Used during optimization
 # =============================================================================
@@ -123,6 +358,7 @@ optimized = load_artifact(SCRIPT_DIR / "optimize.txt")
 # Each scenario should have:
 # - input: The user request or context
 # - expected_behaviors: List of behaviors the response should exhibit
+# - max_tokens: (optional) Output cap for this scenario's response
 #
 # Cover: common cases, edge cases, failure modes, boundary conditions
 
@@ -203,7 +439,7 @@ Check each expected behavior and factor into your scores.
 
 Return ONLY valid JSON (no markdown, no explanation outside JSON):
 {{
-  "reasoning": "<brief explanation of your scoring>",
+  "overall": <1-5>,
   "scores": {{
     "clarity": <1-5>,
     "completeness": <1-5>,
@@ -211,10 +447,32 @@ Return ONLY valid JSON (no markdown, no explanation outside JSON):
     "helpfulness": <1-5>
   }},
   "behaviors_exhibited": ["<list behaviors from expected that were present>"],
-  "overall": <1-5>
+  "reasoning": "<brief explanation of your scoring>"
 }}
 """
 
+# "overall" comes first in the schema so that a reply cut off at
+# MAX_JUDGE_TOKENS still carries the score; this recovers it
+OVERALL_SCORE = re.compile(r'"overall"\s*:\s*([1-5](?:\.\d+)?)')
+
+# The rubric with no per-scenario text, so every judge call shares one system
+# prompt; expected behaviors are sent alongside each response
+JUDGE_RUBRIC = JUDGE_PROMPT.format(
+    expected_behaviors="(listed with the response to evaluate)"
+)
+
+# Appended to the rubric when several responses are judged in one call
+JUDGE_BATCH_FORMAT = """
+## Batch Judging
+
+Several numbered responses follow, each with its own expected behaviors
+(these replace the Expected Behaviors section above). Judge each response
+independently using the rubric above.
+
+Instead of a single object, return ONLY valid JSON of the form:
+{"results": [{"id": <response number>, ...the fields described above...}]}
+"""
+
 
 # =============================================================================
 # EXECUTION AND JUDGING FUNCTIONS
@@ -222,40 +480,224 @@ Return ONLY valid JSON (no markdown, no explanation outside JSON):
 
 def run_with_prompt(prompt: str, scenario: dict) -> str:
     """Execute the prompt being optimized against a scenario."""
-    return chat(
+    # The prompt is identical for every scenario, so cache it as a prefix
+    return cached_chat(
         EXECUTION_MODEL,
         [{"role": "user", "content": scenario["input"]}],
         system=prompt,
-        max_tokens=2048,
+        max_tokens=scenario.get("max_tokens", MAX_EXEC_TOKENS),
+        cache_system=True,
+        stream=True,
+        warn_truncation=True,
     )
 
 
-def judge_response(scenario: dict, response: str) -> dict:
-    """Have a capable LLM judge the response quality."""
-    judge_input = JUDGE_PROMPT.format(
-        expected_behaviors="\n".join(f"- {b}" for b in scenario["expected_behaviors"])
-    )
+def precheck_response(scenario: dict, response: str):
+    """Score an empty response without spending a judge call.
+
+    Returns a minimum-score judgment for an empty or whitespace-only
+    response, or None if the response needs judging. Short responses are
+    always judged: a one-word label or one-line reply can be exactly right.
+    """
+    if response.strip():
+        return None
+    return {"overall": 1.0, "reasoning": "Pre-filter: empty response"}
+
 
-    result = chat(
+def _judge_once(scenario: dict, response: str, vote: int = 0) -> dict:
+    """Have the judge model score the response once.
+
+    vote numbers the independent judge calls, so with WECO_LLM_CACHE=1 each
+    vote is cached separately instead of all replaying the first answer.
+    """
+    behaviors = "\n".join(f"- {b}" for b in scenario["expected_behaviors"])
+
+    # The rubric is the same for every scenario, so it is the (cacheable)
+    # system prompt; this scenario's behaviors go with the response. Anthropic
+    # only caches it once it exceeds the model's minimum cacheable length.
+    result = cached_chat(
         JUDGE_MODEL,
-        [{"role": "user", "content": f"{judge_input}\n\n## Response to Evaluate\n\n{response}"}],
-        max_tokens=512,
+        [{"role": "user", "content": (
+            f"## Expected Behaviors\n\n{behaviors}\n\n"
+            f"## Response to Evaluate\n\n{response}"
+        )}],
+        system=JUDGE_RUBRIC,
+        max_tokens=MAX_JUDGE_TOKENS,
+        cache_system=True,
+        cache_tag=f"vote-{vote}" if vote else None,
     )
 
     # Parse JSON response
     try:
-        return json.loads(result)
+        return json_loads(result)
     except json.JSONDecodeError as e:
+        match = OVERALL_SCORE.search(result)
+        if match:
+            return {"overall": float(match.group(1)), "reasoning": "Truncated judge response"}
         print(f"Warning: Failed to parse judge response: {e}")
         print(f"Raw response: {result}")
         # Return neutral score on parse failure
         return {"overall": 3.0, "reasoning": "Parse error"}
 
 
+def judge_response(scenario: dict, response: str) -> dict:
+    """Judge the response JUDGE_VOTES times in parallel and average the scores."""
+    if JUDGE_VOTES <= 1:
+        return _judge_once(scenario, response)
+
+    with ThreadPoolExecutor(max_workers=JUDGE_VOTES) as executor:
+        votes = list(executor.map(
+            lambda vote: _judge_once(scenario, response, vote), range(JUDGE_VOTES)
+        ))
+
+    judgment = dict(votes[0])
+    judgment["votes"] = [vote["overall"] for vote in votes]
+    judgment["overall"] = sum(judgment["votes"]) / len(votes)
+    return judgment
+
+
+def judge_batch(pairs: list) -> list:
+    """Judge several (scenario, response) pairs in a single judge call.
+
+    The rubric is sent once as a cached system prompt. Any pair missing from
+    the judge's output, or the whole batch if the output does not parse,
+    falls back to judge_response().
+    """
+    if len(pairs) == 1:
+        return [judge_response(*pairs[0])]
+
+    rubric = JUDGE_RUBRIC + JUDGE_BATCH_FORMAT
+    items = "\n\n".join(
+        f"### Response {i}\n\nExpected behaviors:\n"
+        + "\n".join(f"- {b}" for b in scenario["expected_behaviors"])
+        + f"\n\nResponse:\n{response}"
+        for i, (scenario, response) in enumerate(pairs)
+    )
+
+    result = cached_chat(
+        JUDGE_MODEL,
+        [{"role": "user", "content": items}],
+        system=rubric,
+        max_tokens=MAX_JUDGE_TOKENS * len(pairs),
+        cache_system=True,
+    )
+
+    try:
+        by_id = {r["id"]: r for r in json_loads(result)["results"]}
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"Warning: Failed to parse batch judge response, judging individually: {e}")
+        by_id = {}
+
+    return [
+        by_id[i] if "overall" in by_id.get(i, {}) else judge_response(scenario, response)
+        for i, (scenario, response) in enumerate(pairs)
+    ]
+
+
+def score_scenarios(prompt, scenarios):
+    """Execute and judge every scenario, yielding (index, score) as each finishes.
+
+    The score is None for scenarios lost to transient API errors.
+
+    Execution and judging run in separate pools: as soon as a scenario's
+    response arrives its judge call is queued (in groups of JUDGE_BATCH_SIZE),
+    so judging overlaps with the remaining executions instead of holding an
+    execution slot. The pools only bound threads; chat() caps the requests
+    they have in flight at MAX_CONCURRENCY.
+    """
+    max_workers = min(len(scenarios), MAX_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max_workers) as exec_pool, \
+            ThreadPoolExecutor(max_workers=max_workers) as judge_pool:
+        # Scenarios with the same input share one execution; each one is still
+        # judged against its own expected behaviors
+        groups = {}
+        for i, scenario in enumerate(scenarios):
+            key = (scenario["input"], scenario.get("max_tokens", MAX_EXEC_TOKENS))
+            groups.setdefault(key, []).append(i)
+        exec_futures = {
+            exec_pool.submit(run_with_prompt, prompt, scenarios[indices[0]]): indices
+            for indices in groups.values()
+        }
+        judge_futures = {}
+        batch = []
+
+        def submit_batch():
+            pairs = [(scenarios[i], response) for i, response in batch]
+            judge_futures[judge_pool.submit(judge_batch, pairs)] = [i for i, _ in batch]
+            batch.clear()
+
+        for future in as_completed(exec_futures):
+            indices = exec_futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                for i in indices:
+                    yield i, failure_score(f"scenario {i+1}", e)
+                continue
+            for i in indices:
+                judgment = precheck_response(scenarios[i], response)
+                if judgment is not None:
+                    yield i, judgment["overall"]
+                    continue
+                batch.append((i, response))
+                if len(batch) >= JUDGE_BATCH_SIZE:
+                    submit_batch()
+        if batch:
+            submit_batch()
+
+        for future in as_completed(judge_futures):
+            indices = judge_futures[future]
+            try:
+                judgments = future.result()
+            except Exception as e:
+                for i in indices:
+                    yield i, failure_score(f"scenario {i+1}", e)
+                continue
+            for i, judgment in zip(indices, judgments):
+                try:
+                    score = float(judgment["overall"])
+                except (KeyError, TypeError, ValueError):
+                    score = failure_score(
+                        f"scenario {i+1}", ValueError(f"judge returned no overall score: {judgment}")
+                    )
+                yield i, score
+
+
 # =============================================================================
 # MAIN EVALUATION LOOP
 # =============================================================================
 
+def evaluate(prompt):
+    """Run every training scenario against prompt and return the average score.
+
+    Raises IncompleteEvaluation if any scenario was lost to a transient API
+    error, rather than averaging over a different subset of scenarios.
+    """
+    scores = {}  # scenario index -> overall score
+    lost = 0
+
+    # Scenarios are independent and network-bound, so they run concurrently
+    for i, score in score_scenarios(prompt, TRAINING_SCENARIOS):
+        if score is None:
+            lost += 1
+            continue
+        scores[i] = score
+        print(f"Scenario {i+1}/{len(TRAINING_SCENARIOS)}: {score:.2f}/5")
+
+    # Spread diagnostics (stderr) help spot bimodal failures across scenarios
+    if scores:
+        worst = min(scores, key=scores.get)
+        print(f"  min={scores[worst]:.2f} std={statistics.pstdev(scores.values()):.2f} "
+              f"worst=scenario {worst+1}", file=sys.stderr)
+
+    if lost:
+        raise IncompleteEvaluation(
+            f"{lost} of {len(TRAINING_SCENARIOS)} scenarios lost to API errors; "
+            "no score reported, re-run this step"
+        )
+    return statistics.mean(scores.values())
+
+
 if __name__ == "__main__":
     if not TRAINING_SCENARIOS or "TODO" in str(TRAINING_SCENARIOS[0]):
         print("Error: TRAINING_SCENARIOS not configured. Edit this file.")
@@ -270,28 +712,35 @@ if __name__ == "__main__":
         print("prompt_quality: 0.00")
         exit(1)
 
-    total_score = 0.0
-    scenario_count = 0
-
-    for i, scenario in enumerate(TRAINING_SCENARIOS):
+    if "--persistent" in sys.argv:
+        # Persistent mode: read one artifact path per line from stdin and print
+        # a metric for each. Interpreter startup, SDK imports and the HTTP
+        # connection pool are paid once instead of once per evaluation.
+        for line in sys.stdin:
+            path = line.strip()
+            if not path:
+                continue
+            # Exactly one stdout line per path, so callers can pair results
+            # with inputs; a bad artifact must not end the loop
+            try:
+                prompt = load_artifact(path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error: cannot read {path}: {e}", flush=True)
+                continue
+            try:
+                # Per-scenario progress and warnings go to stderr here
+                with contextlib.redirect_stdout(sys.stderr):
+                    score = evaluate(prompt)
+            except Exception as e:
+                print(f"Error: {path}: {e}", flush=True)
+            else:
+                print(f"prompt_quality: {score:.2f}", flush=True)
+    else:
         try:
-            # Execute the prompt
-            response = run_with_prompt(optimized, scenario)
-
-            # Judge the response
-            judgment = judge_response(scenario, response)
-            score = judgment["overall"]
-
-            total_score += score
-            scenario_count += 1
-
-            print(f"Scenario {i+1}/{len(TRAINING_SCENARIOS)}: {score:.2f}/5")
-
-        except Exception as e:
-            print(f"Error in scenario {i+1}: {e}")
-            total_score += 1.0  # Penalize failures
-            scenario_count += 1
-
-    # Final metric for Weco
-    avg_score = total_score / scenario_count if scenario_count > 0 else 0.0
-    print(f"prompt_quality: {avg_score:.2f}")
+            score = evaluate(optimized)
+        except IncompleteEvaluation as e:
+            # No metric line: a partial average would not be comparable
+            print(f"Error: {e}", file=sys.stderr)
+            exit(1)
+        # Final metric for Weco
+        print(f"prompt_quality: {score:.2f}")
@@ -8,11 +8,21 @@ regular messages - Weco will see them and avoid solutions that violate constrain
 """
 import time
 import importlib.util
+import sys
+from pathlib import Path
 
 
 def load_module(path):
-    spec = importlib.util.spec_from_file_location("mod", path)
+    """Import a file as a module named after its stem (e.g. "optimize").
+
+    Registering it in sys.modules lets pickle and dataclasses resolve objects
+    defined in the file. The source loader reuses __pycache__ bytecode, so an
+    unchanged file is not re-parsed on later Weco steps.
+    """
+    name = Path(path).stem
+    spec = importlib.util.spec_from_file_location(name, path)
     mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
     spec.loader.exec_module(mod)
     return mod
 
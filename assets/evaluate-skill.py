@@ -12,6 +12,11 @@ IMPORTANT: API key (ANTHROPIC_API_KEY or OPENAI_API_KEY) must be available
 via .env file or environment variable. The agent must never read, check,
 or handle API keys directly.
 
+Set WECO_LLM_CACHE=1 to reuse identical skill, simulator and grader calls
+across Weco steps from an on-disk cache. Leave it unset when
+measuring baseline variance: cached runs replay the same conversations and
+report zero variance.
+
 IMPORTANT: Run the environment pre-flight before first use:
 1. Create a venv: python -m venv .venv && source .venv/bin/activate
 2. Install deps: pip install anthropic python-dotenv  (or: pip install openai python-dotenv)
@@ -19,10 +24,20 @@ IMPORTANT: Run the environment pre-flight before first use:
 4. Dry-run: bash evaluate.sh
 See SKILL.md "Environment Pre-flight" for the full checklist.
 """
+import asyncio
+import atexit
+import functools
+import hashlib
 import json
+import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from uuid import uuid4
 
 # Load API keys from .env file if present
 try:
@@ -31,6 +46,21 @@ try:
 except ImportError:
     pass
 
+# Parse grader and driver output and write transcripts with orjson when
+# installed: faster, strict about malformed JSON, and it serializes straight
+# to UTF-8 bytes. orjson.JSONDecodeError subclasses ValueError.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps_bytes(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps_bytes(obj):
+        return json.dumps(obj, indent=2).encode()
 
 # =============================================================================
 # PROVIDER CONFIGURATION — set to "anthropic" or "openai"
@@ -38,6 +68,26 @@ except ImportError:
 
 PROVIDER = "anthropic"
 
+# Import the SDK once at module load rather than inside every request. A
+# missing package is raised from get_client() instead, so validate_models()
+# reports it and the script still prints its metric line.
+_sdk_import_error = None
+try:
+    if PROVIDER == "anthropic":
+        from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient
+    elif PROVIDER == "openai":
+        from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+except ImportError as e:
+    _sdk_import_error = e
+
+# Multiplex concurrent requests over one HTTP/2 connection when httpx's
+# optional h2 dependency is installed (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
 # =============================================================================
 # MODEL CONFIGURATION
 # =============================================================================
@@ -47,39 +97,86 @@ PROVIDER = "anthropic"
 # Model for running the skill (the "agent under test")
 SKILL_MODEL = "claude-sonnet-4-5"
 
-# Model for the user simulator (cheaper model is fine)
+# Model for the user simulator, which also decides whether the assistant is
+# waiting for input when the reply itself does not say (cheaper model is fine)
 SIMULATOR_MODEL = "claude-haiku-4-5"
 
-# Model for checking if user input is needed (cheap, fast)
-INPUT_CHECK_MODEL = "claude-haiku-4-5"
-
 # Model for grading transcripts (use a capable model)
 JUDGE_MODEL = "claude-sonnet-4-5"
 
 # Maximum conversation turns per scenario
 MAX_TURNS = 10
 
+# Recent messages the user simulator sees, besides the opening request, so
+# its prompt stays the same size however long the conversation runs
+SIMULATOR_CONTEXT_MESSAGES = 4
+
+# Maximum API requests in flight at once (bounded by provider rate limits)
+MAX_CONCURRENCY = 8
+
 # All models used in this script (for validation)
-ALL_MODELS = list(set([SKILL_MODEL, SIMULATOR_MODEL, INPUT_CHECK_MODEL, JUDGE_MODEL]))
+ALL_MODELS = list(set([SKILL_MODEL, SIMULATOR_MODEL, JUDGE_MODEL]))
+
+# A successful validation is reused by later runs for this long (seconds)
+MODELS_OK_TTL = 3600
+
+# Per-request timeout (seconds) and SDK retry count for the shared client.
+# Skill turns can generate up to 4096 tokens, so allow more than a minute.
+# The SDK retries rate limits, overload and connection errors with
+# exponential backoff, so transient failures do not end up as scores.
+API_TIMEOUT = 120.0
+API_MAX_RETRIES = 5
 
 
 # =============================================================================
 # PROVIDER ABSTRACTION
 # =============================================================================
 
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared provider client, creating it on first use.
+
+    Creation is deferred so a missing API key is reported by validate_models()
+    instead of crashing at import time.
+
+    SDK clients are thread-safe and keep a connection pool, so every turn,
+    simulator call and grade reuses one client instead of paying TLS setup
+    per request.
+    """
+    global _client
+    if _sdk_import_error is not None:
+        raise _sdk_import_error
+    with _client_lock:
+        if _client is None:
+            if PROVIDER == "anthropic":
+                _client = Anthropic(
+                    max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                    http_client=DefaultHttpxClient(http2=True) if HTTP2 else None,
+                )
+            elif PROVIDER == "openai":
+                _client = OpenAI(
+                    max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                    http_client=DefaultHttpxClient(http2=True) if HTTP2 else None,
+                )
+            else:
+                raise ValueError(f"Unknown provider: {PROVIDER}")
+        return _client
+
+
 def chat(model, messages, system=None, max_tokens=1024):
     """Send a chat request to the configured provider."""
     if PROVIDER == "anthropic":
-        from anthropic import Anthropic
-        client = Anthropic()
+        client = get_client()
         kwargs = {"model": model, "max_tokens": max_tokens, "messages": messages}
         if system:
             kwargs["system"] = system
         response = client.messages.create(**kwargs)
         return response.content[0].text
     elif PROVIDER == "openai":
-        from openai import OpenAI
-        client = OpenAI()
+        client = get_client()
         full_messages = []
         if system:
             full_messages.append({"role": "system", "content": system})
@@ -92,21 +189,212 @@ def chat(model, messages, system=None, max_tokens=1024):
         raise ValueError(f"Unknown provider: {PROVIDER}")
 
 
+def is_transient_error(e):
+    """True for rate-limit (429), overload (529), server and connection errors.
+
+    The SDK client already retries these API_MAX_RETRIES times with
+    exponential backoff, so one that still fails says nothing about the
+    artifact being evaluated.
+    """
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(e).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def is_config_error(e):
+    """True for errors that no retry or re-run will fix: a rejected API key
+    (401), a forbidden model (403) or an unknown model (404).
+
+    These abort the run instead of scoring the scenario, since penalizing
+    the skill for them would report a metric that measures nothing.
+    """
+    return getattr(e, "status_code", None) in (401, 403, 404)
+
+
+def failure_score(label, e):
+    """Score for a failed scenario: None (lost) if transient, else 1.0.
+
+    A lost scenario invalidates the whole run: averaging over the remaining
+    subset would make this step's metric incomparable with other steps.
+    """
+    if is_transient_error(e):
+        print(f"  Skipping {label}: API unavailable after retries: {e}", file=sys.stderr)
+        return None
+    print(f"  Error in {label}: {e}", file=sys.stderr)
+    return 1.0  # Penalize failures
+
+
+_async_client = None
+_request_semaphore = None
+
+
+def get_async_client():
+    """Return the shared async provider client, creating it on first use."""
+    global _async_client
+    if _sdk_import_error is not None:
+        raise _sdk_import_error
+    if _async_client is None:
+        if PROVIDER == "anthropic":
+            _async_client = AsyncAnthropic(
+                max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                http_client=DefaultAsyncHttpxClient(http2=True) if HTTP2 else None,
+            )
+        elif PROVIDER == "openai":
+            _async_client = AsyncOpenAI(
+                max_retries=API_MAX_RETRIES, timeout=API_TIMEOUT,
+                http_client=DefaultAsyncHttpxClient(http2=True) if HTTP2 else None,
+            )
+        else:
+            raise ValueError(f"Unknown provider: {PROVIDER}")
+    return _async_client
+
+
+def get_request_semaphore():
+    """Return the semaphore bounding concurrent async requests."""
+    global _request_semaphore
+    if _request_semaphore is None:
+        _request_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _request_semaphore
+
+
+def reset_async_state():
+    """Forget the async client and semaphore.
+
+    Both are bound to the event loop that first used them, so every
+    asyncio.run() (baseline repeats, held-out runs) must start without them.
+    """
+    global _async_client, _request_semaphore
+    _async_client = None
+    _request_semaphore = None
+
+
+async def close_async_state():
+    """Close the async client on its own event loop, then reset."""
+    client = _async_client
+    reset_async_state()
+    if client is not None:
+        await client.close()
+
+
+async def chat_async(model, messages, system=None, max_tokens=1024, cache_system=False,
+                     stop_at_marker=False, json_mode=False):
+    """Async version of chat(), used by the multi-turn harness and grader.
+
+    system may be a string or a list of strings, sent in order. With
+    cache_system=True each part becomes an Anthropic prompt-cache breakpoint,
+    so a static prefix is billed and prefilled at the cached rate on every
+    later turn. OpenAI caches shared prefixes automatically.
+
+    With stop_at_marker=True the reply is streamed and the connection closed
+    as soon as a <<WAIT>>/<<DONE>> status marker arrives, instead of waiting
+    for the model to stop on its own.
+
+    json_mode=True asks OpenAI for a JSON object response. Anthropic has no
+    equivalent, so callers still tolerate prose around the JSON.
+
+    At most MAX_CONCURRENCY requests are in flight at once across all
+    scenarios, keeping the run within provider rate limits.
+    """
+    parts = [system] if isinstance(system, str) else list(system or [])
+    async with get_request_semaphore():
+        if PROVIDER == "anthropic":
+            client = get_async_client()
+            kwargs = {"model": model, "max_tokens": max_tokens, "messages": messages}
+            if parts and cache_system:
+                kwargs["system"] = [
+                    {"type": "text", "text": part, "cache_control": {"type": "ephemeral"}}
+                    for part in parts
+                ]
+            elif parts:
+                kwargs["system"] = "\n\n".join(parts)
+            if stop_at_marker:
+                async with client.messages.stream(**kwargs) as stream:
+                    return await read_until_marker(stream.text_stream)
+            response = await client.messages.create(**kwargs)
+            return response.content[0].text
+        elif PROVIDER == "openai":
+            client = get_async_client()
+            full_messages = []
+            if parts:
+                full_messages.append({"role": "system", "content": "\n\n".join(parts)})
+            full_messages.extend(messages)
+            if stop_at_marker:
+                stream = await client.chat.completions.create(
+                    model=model, max_tokens=max_tokens, messages=full_messages, stream=True,
+                )
+                try:
+                    return await read_until_marker(
+                        chunk.choices[0].delta.content or ""
+                        async for chunk in stream if chunk.choices
+                    )
+                finally:
+                    await stream.close()
+            extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+            response = await client.chat.completions.create(
+                model=model, max_tokens=max_tokens, messages=full_messages, **extra,
+            )
+            return response.choices[0].message.content
+        else:
+            raise ValueError(f"Unknown provider: {PROVIDER}")
+
+
+async def read_until_marker(text_stream):
+    """Collect streamed text up to and including the first status marker."""
+    text = ""
+    async for chunk in text_stream:
+        # Only rescan the tail, where a marker split across chunks can end
+        start = max(0, len(text) - len("<<WAIT>>"))
+        text += chunk
+        match = STATUS_STOP.search(text, start)
+        if match:
+            return text[:match.end()]
+    return text
+
+
 # =============================================================================
 # MODEL VALIDATION
 # =============================================================================
 
-def validate_models():
-    """Smoke test that all configured models are available."""
-    all_ok = True
-    for model_id in ALL_MODELS:
+def _ping_one(model_id):
+    """Send a one-token request to a model. Returns (model_id, ok, error)."""
+    try:
+        chat(model_id, [{"role": "user", "content": "hi"}], max_tokens=1)
+        print(f"  ok: {model_id}", file=sys.stderr)
+        return model_id, True, None
+    except Exception as e:
+        print(f"  FAILED: {model_id} - {e}", file=sys.stderr)
+        return model_id, False, e
+
+
+def validate_models(stamp_path=None):
+    """Smoke test that all configured models are available.
+
+    Models are pinged concurrently, so startup waits for the slowest model
+    rather than the sum of all of them. With stamp_path, a success is
+    recorded there and reused for MODELS_OK_TTL seconds, so the repeated
+    runs of an optimization skip validation unless the models change.
+    """
+    models_key = "\n".join([PROVIDER] + sorted(ALL_MODELS))
+    if stamp_path is not None and _sdk_import_error is None:
+        stamp_path = Path(stamp_path)
         try:
-            chat(model_id, [{"role": "user", "content": "hi"}], max_tokens=1)
-            print(f"  ok: {model_id}", file=sys.stderr)
-        except Exception as e:
-            print(f"  FAILED: {model_id} - {e}", file=sys.stderr)
-            all_ok = False
-    return all_ok
+            fresh = time.time() - stamp_path.stat().st_mtime < MODELS_OK_TTL
+            if fresh and stamp_path.read_text() == models_key:
+                print("  ok: all models (validated recently)", file=sys.stderr)
+                return True
+        except OSError:
+            pass
+
+    with ThreadPoolExecutor(max_workers=len(ALL_MODELS)) as executor:
+        results = list(executor.map(_ping_one, ALL_MODELS))
+    if not all(ok for _, ok, _ in results):
+        return False
+
+    if stamp_path is not None:
+        stamp_path.parent.mkdir(parents=True, exist_ok=True)
+        stamp_path.write_text(models_key)
+    return True
 
 
 # =============================================================================
@@ -118,9 +406,15 @@ def validate_models():
 # or any other location — it always looks for optimize.md alongside itself.
 SCRIPT_DIR = Path(__file__).parent
 
+@functools.lru_cache(maxsize=4)
+def _read_artifact(path, mtime_ns):
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
 def load_artifact(path):
-    with open(path) as f:
-        return f.read()
+    """Read an artifact, reusing the cached text until the file changes."""
+    return _read_artifact(str(path), os.stat(path).st_mtime_ns)
 
 
 # The skill being optimized (same directory as this script)
@@ -131,25 +425,97 @@ optimized = load_artifact(SCRIPT_DIR / "optimize.md")
 # REFERENCES (optional - included in system prompt alongside the skill)
 # =============================================================================
 
+# Appended to the system prompt so every reply says whether the assistant is
+# waiting on the user. The harness reads the marker instead of spending an
+# extra LLM call per turn to classify the reply.
+STATUS_INSTRUCTIONS = """
+
+---
+# Conversation status (evaluation harness)
+
+End every reply with a final line containing only <<WAIT>> if you need a
+response from the user before continuing, or <<DONE>> if you are finished."""
+
+STATUS_MARKER = re.compile(r"\s*<<(WAIT|DONE)>>\s*$")
+STATUS_STOP = re.compile(r"<<(?:WAIT|DONE)>>")
+
+
+def split_status(reply):
+    """Strip the trailing status marker. Returns (text, "WAIT"/"DONE"/None)."""
+    match = STATUS_MARKER.search(reply)
+    if not match:
+        return reply, None
+    return reply[:match.start()], match.group(1)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_references(references_dir, refs_stamp):
+    """Concatenate the reference files; refs_stamp invalidates on any change."""
+    ref_content = [
+        f"\n\n---\n## Reference: {ref_file.stem}\n\n{ref_file.read_text()}"
+        for ref_file in sorted(Path(references_dir).glob("*.md"))
+    ]
+    return "\n\n# References" + "".join(ref_content) if ref_content else ""
+
+
 def build_system_prompt(skill_content, references_dir=None):
-    """Build system prompt from skill content and optional references."""
-    system = skill_content
+    """Build system prompt from skill content and optional references.
 
+    The references block is memoized separately on the name and mtime of
+    every reference file, so building prompts for different skill versions
+    (baseline runs, held-out validation) only re-reads references after one
+    of them changes.
+    """
+    system = skill_content
     if references_dir and Path(references_dir).exists():
-        ref_content = []
-        for ref_file in sorted(Path(references_dir).glob("*.md")):
-            ref_content.append(
-                f"\n\n---\n## Reference: {ref_file.stem}\n\n{ref_file.read_text()}"
-            )
-        if ref_content:
-            system += "\n\n# References" + "".join(ref_content)
-
-    return system
+        refs_stamp = tuple(
+            (ref_file.name, ref_file.stat().st_mtime_ns)
+            for ref_file in sorted(Path(references_dir).glob("*.md"))
+        )
+        system += _load_references(str(references_dir), refs_stamp)
+    return system + STATUS_INSTRUCTIONS
 
 
 # Path to references directory (set to None if no references)
 REFERENCES_DIR = SCRIPT_DIR / "references" if (SCRIPT_DIR / "references").exists() else None
 
+# Skill + references are static for the whole run, so build them once
+SYSTEM_PROMPT = build_system_prompt(optimized, REFERENCES_DIR)
+
+
+# =============================================================================
+# RESPONSE CACHE (opt-in via WECO_LLM_CACHE=1)
+# =============================================================================
+# Weco re-runs this script every step. Conversations replay identically until
+# the skill changes what the assistant says, and the simulator and grader
+# prompts are pure functions of the transcript, so identical
+# requests are served from disk instead of paying for them again.
+
+CACHE_ENABLED = os.environ.get("WECO_LLM_CACHE") == "1"
+CACHE_DIR = SCRIPT_DIR / ".cache"
+
+
+async def cached_chat_async(model, messages, **kwargs):
+    """chat_async() backed by an on-disk cache keyed on the full request."""
+    if not CACHE_ENABLED:
+        return await chat_async(model, messages, **kwargs)
+
+    request = json.dumps([PROVIDER, model, messages, kwargs], sort_keys=True)
+    path = CACHE_DIR / f"{hashlib.sha256(request.encode()).hexdigest()}.json"
+    try:
+        return json.loads(path.read_text())["text"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    text = await chat_async(model, messages, **kwargs)
+
+    # Write atomically so a concurrent run never reads a partial entry
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{uuid4().hex}.tmp")
+    tmp.write_text(json.dumps({"text": text}))
+    os.replace(tmp, path)
+    return text
+
 
 # =============================================================================
 # TRAINING SCENARIOS - Used during optimization
@@ -158,9 +524,15 @@ REFERENCES_DIR = SCRIPT_DIR / "references" if (SCRIPT_DIR / "references").exists
 # Each scenario should have:
 # - name: Identifier for the scenario
 # - initial_message: What the user asks initially
-# - context_files: (optional) Files to include in the first message
+# - context_files: (optional) Files the user provides (sent after the skill
+#   in the system prompt, so they stay in the cached prefix on every turn)
 # - user_simulator_instructions: How the simulated user should behave
-# - expected_behaviors: List of behaviors the skill should exhibit
+# - scripted_replies: (optional) Fixed user replies, used in order instead of
+#   the simulator; the simulator takes over once they run out
+# - expected_behaviors: List of behaviors the skill should exhibit. One of the
+#   exact form 'Mentions "weco run"' (or Says/Uses/Includes/Contains) is
+#   checked by substring; if every behavior in a scenario has that form, the
+#   judge call is skipped.
 #
 # Cover: happy path, edge cases, clarification needed, constraint tests
 
@@ -207,81 +579,174 @@ TRAINING_SCENARIOS = [
 # MULTI-TURN CONVERSATION HARNESS
 # =============================================================================
 
-def run_scenario(skill_content, scenario, max_turns=MAX_TURNS):
+async def run_scenario(system_prompt, scenario, max_turns=MAX_TURNS):
     """Run a single multi-turn scenario and return the transcript."""
-    system_prompt = build_system_prompt(skill_content, REFERENCES_DIR)
-
-    # Build the initial user message, including context files if any
-    initial_content = scenario["initial_message"]
+    # The system prompt is byte-identical on every turn so provider prompt
+    # caching applies: the static skill + references first (shared by all
+    # scenarios), then this scenario's context files (shared by its turns).
+    system = [system_prompt]
     if scenario.get("context_files"):
         files_context = "\n\n".join(
             f"File: `{name}`\n```\n{content}\n```"
             for name, content in scenario["context_files"].items()
         )
-        initial_content = f"{files_context}\n\n{initial_content}"
+        system.append(f"# Files provided by the user\n\n{files_context}")
 
     # Start conversation
-    messages = [{"role": "user", "content": initial_content}]
+    messages = [{"role": "user", "content": scenario["initial_message"]}]
 
-    assistant_msg = chat(SKILL_MODEL, messages, system=system_prompt, max_tokens=4096)
-    messages.append({"role": "assistant", "content": assistant_msg})
+    # The model sees its replies with the status marker, so it keeps emitting
+    # it; the transcript the simulator and grader read has it stripped
+    reply = await cached_chat_async(
+        SKILL_MODEL, messages, system=system, max_tokens=4096,
+        cache_system=True, stop_at_marker=True,
+    )
+    messages.append({"role": "assistant", "content": reply})
+    assistant_msg, status = split_status(reply)
 
     transcript = [
         {"role": "user", "content": scenario["initial_message"]},
         {"role": "assistant", "content": assistant_msg},
     ]
+    transcript_parts = [format_message(msg) for msg in transcript]
 
     # Continue until done or max turns
+    scripted_replies = scenario.get("scripted_replies", [])
     turns = 1
-    while turns < max_turns and needs_user_input(transcript):
-        user_reply = simulate_user(transcript, scenario["user_simulator_instructions"])
+    while turns < max_turns:
+        user_reply = await next_user_turn(
+            transcript, transcript_parts, status, scenario["user_simulator_instructions"],
+            scripted_replies[turns - 1] if turns - 1 < len(scripted_replies) else None,
+        )
+        if user_reply is None:
+            break
 
         messages.append({"role": "user", "content": user_reply})
 
-        assistant_msg = chat(SKILL_MODEL, messages, system=system_prompt, max_tokens=4096)
-        messages.append({"role": "assistant", "content": assistant_msg})
+        reply = await cached_chat_async(
+            SKILL_MODEL, messages, system=system, max_tokens=4096,
+            cache_system=True, stop_at_marker=True,
+        )
+        messages.append({"role": "assistant", "content": reply})
+        assistant_msg, status = split_status(reply)
 
-        transcript.append({"role": "user", "content": user_reply})
-        transcript.append({"role": "assistant", "content": assistant_msg})
+        for msg in ({"role": "user", "content": user_reply},
+                    {"role": "assistant", "content": assistant_msg}):
+            transcript.append(msg)
+            transcript_parts.append(format_message(msg))
         turns += 1
 
     return transcript
 
 
-def needs_user_input(transcript):
-    """Use an LLM to judge whether the conversation needs user input.
+WAITING_PATTERN = re.compile(
+    r"(\?\s*$|please (confirm|clarify|provide)|let me know|which .* would you like|shall I)",
+    re.I | re.M,
+)
 
-    Returns True if the assistant is waiting for a response, False if done.
-    """
-    transcript_text = format_transcript(transcript)
 
-    response = chat(
-        INPUT_CHECK_MODEL,
-        [{"role": "user", "content": f"""Analyze this conversation between a user and an AI assistant.
+def needs_user_input_fast(transcript):
+    """Guess from the last assistant message whether it is waiting for input.
 
-Determine if the assistant is:
-1. WAITING for user input (asked a question, requested confirmation, needs information)
-2. DONE (task complete, or assistant is working autonomously without needing input)
+    Returns True/False, or None when the message is too short or has no
+    sentence punctuation to judge from.
+    """
+    last = transcript[-1]["content"].strip()
+    if len(last) < 40 or ("." not in last and "?" not in last):
+        return None
+    return bool(WAITING_PATTERN.search(last))
 
-Conversation:
-{transcript_text}
 
-Reply with exactly one word: WAITING or DONE"""}],
-        max_tokens=16,
-    )
+def needs_user_input(transcript, status=None):
+    """Decide whether the conversation needs user input without an API call.
 
-    return "WAITING" in response
+    Uses the assistant's own status marker when present, then a regex
+    heuristic. Returns True if the assistant is waiting for a response,
+    False if done, or None when neither is conclusive.
+    """
+    if status is not None:
+        return status == "WAIT"
+    return needs_user_input_fast(transcript)
 
 
 # =============================================================================
 # USER SIMULATOR
 # =============================================================================
 
-def simulate_user(transcript, instructions):
-    """Generate a simulated user response."""
-    transcript_text = format_transcript(transcript)
+DRIVER_PROMPT = """You are simulating a user interacting with an AI assistant.
+
+Instructions for how to behave:
+{instructions}
+
+The conversation so far:
+{transcript_text}
+
+First decide whether the assistant is:
+- "waiting" for user input (asked a question, requested confirmation, needs information)
+- "done" (task complete, or assistant is working autonomously without needing input)
 
-    return chat(
+If it is waiting, write the next user response. Be concise and natural.
+
+Reply with only a JSON object:
+{{"status": "waiting" or "done", "user_reply": "<next user message, or empty if done>"}}"""
+
+DRIVER_STATUS = re.compile(r'"status"\s*:\s*"(waiting|done)"', re.I)
+DRIVER_REPLY = re.compile(r'"user_reply"\s*:\s*"((?:[^"\\]|\\.)*)"', re.S)
+
+
+async def next_user_turn(transcript, transcript_parts, status, instructions,
+                         scripted_reply=None):
+    """Return the next simulated user message, or None if the assistant is done.
+
+    transcript_parts holds format_message() of each transcript entry, kept up
+    to date by the caller so the transcript text is never rebuilt per turn.
+    The simulator sees only the opening request and the last
+    SIMULATOR_CONTEXT_MESSAGES messages. A scripted_reply is used as-is instead of asking the simulator.
+
+    When the status marker and heuristic are inconclusive, one driver call
+    both classifies the turn and writes the reply, instead of a classifier
+    call followed by a separate simulator call.
+    """
+    waiting = needs_user_input(transcript, status)
+    if waiting is False:
+        return None
+    if waiting and scripted_reply is not None:
+        return scripted_reply
+    transcript_text = "\n\n".join(tail(transcript_parts, SIMULATOR_CONTEXT_MESSAGES))
+    if waiting:
+        return await simulate_user(transcript_text, instructions)
+
+    response = await cached_chat_async(
+        SIMULATOR_MODEL,
+        [{"role": "user", "content": DRIVER_PROMPT.format(
+            instructions=instructions,
+            transcript_text=transcript_text,
+        )}],
+        max_tokens=512,
+        json_mode=True,
+    )
+    try:
+        start, end = response.index("{"), response.rindex("}") + 1
+        result = json_loads(response[start:end])
+        waiting = str(result.get("status", "")).lower() == "waiting"
+        reply = str(result.get("user_reply") or "")
+    except (ValueError, AttributeError):
+        # No JSON object, malformed JSON, or JSON that is not an object
+        match = DRIVER_STATUS.search(response)
+        waiting = bool(match) and match.group(1).lower() == "waiting"
+        match = DRIVER_REPLY.search(response)
+        reply = match.group(1).replace('\\"', '"').replace("\\n", "\n") if match else ""
+
+    if not waiting:
+        return None
+    if scripted_reply is not None:
+        return scripted_reply
+    return reply.strip() or await simulate_user(transcript_text, instructions)
+
+
+async def simulate_user(transcript_text, instructions):
+    """Generate a simulated user response."""
+    return await cached_chat_async(
         SIMULATOR_MODEL,
         [{"role": "user", "content": f"""You are simulating a user interacting with an AI assistant.
 
@@ -326,35 +791,70 @@ Output your analysis as JSON:
 }}"""
 
 
-def grade_transcript(transcript, expected_behaviors):
-    """Grade a transcript against expected behaviors. Returns 1-5."""
+OVERALL_SCORE = re.compile(r'"overall"\s*:\s*([1-5])')
+SCORE_LINE = re.compile(r"^\s*SCORE:\s*([1-5])", re.M)
+
+# Only this exact shape is checked literally: one verb and one quoted phrase,
+# nothing else. Anything with negation, alternatives or qualifiers
+# ('Does not say "X"', 'Asks for "A" or "B"') goes to the judge.
+LITERAL_BEHAVIOR = re.compile(
+    r'^\s*(?:mentions|says|uses|includes|contains)\s+(?:"([^"]+)"|`([^`]+)`)\s*\.?\s*$',
+    re.I,
+)
+
+
+def _matches_literally(behavior, text):
+    """Check a behavior of the form 'Mentions "X"' by substring.
+
+    Returns True/False (case-insensitive match against the text), or None
+    when the behavior is not in that strict form and needs the judge.
+    """
+    match = LITERAL_BEHAVIOR.match(behavior)
+    if not match:
+        return None
+    phrase = match.group(1) or match.group(2)
+    return phrase.lower() in text.lower()
+
+
+async def grade_transcript(transcript, expected_behaviors):
+    """Grade a transcript against expected behaviors. Returns 1-5.
+
+    When every behavior is a literal check ('Mentions "X"'), the score is
+    the fraction of phrases found in the assistant's replies, scaled to 1-5, and the
+    judge is not called.
+    """
+    assistant_text = "\n".join(m["content"] for m in transcript if m["role"] == "assistant")
+    literal = [_matches_literally(b, assistant_text) for b in expected_behaviors]
+    if literal and None not in literal:
+        return round(1 + 4 * sum(literal) / len(literal), 2)
+
     behaviors_list = "\n".join(f"- {b}" for b in expected_behaviors)
     transcript_text = format_transcript(transcript)
 
-    text = chat(
+    text = await cached_chat_async(
         JUDGE_MODEL,
         [{"role": "user", "content": GRADER_PROMPT.format(
             behaviors_list=behaviors_list,
             transcript_text=transcript_text,
         )}],
         max_tokens=1024,
+        json_mode=True,
     )
 
-    # Try JSON parsing first
+    # Try JSON parsing first, allowing for prose around the object. The score
+    # must be a number in 1-5 (null, "4" or 7 are not trusted as-is).
     try:
-        result = json.loads(text)
-        return result.get("overall", 3)
-    except json.JSONDecodeError:
+        start, end = text.index("{"), text.rindex("}") + 1
+        score = float(json_loads(text[start:end])["overall"])
+        if 1 <= score <= 5:
+            return score
+    except (ValueError, TypeError, KeyError):
         pass
 
-    # Fallback: look for SCORE: X pattern
-    for line in reversed(text.split("\n")):
-        line = line.strip()
-        if line.startswith("SCORE:"):
-            try:
-                return int(line.split(":")[1].strip())
-            except (ValueError, IndexError):
-                pass
+    # Fallback: pull the score out of truncated or malformed output
+    match = OVERALL_SCORE.search(text) or SCORE_LINE.search(text)
+    if match:
+        return int(match.group(1))
 
     # Last resort fallback
     return 3
@@ -364,20 +864,46 @@ def grade_transcript(transcript, expected_behaviors):
 # HELPERS
 # =============================================================================
 
+def tail(items, k):
+    """The first item (the opening request) plus the last k items."""
+    if len(items) <= k + 1:
+        return list(items)
+    return [items[0]] + list(items[-k:])
+
+
+def format_message(msg):
+    return f"{msg['role'].upper()}: {msg['content']}"
+
+
 def format_transcript(transcript):
-    return "\n\n".join(
-        f"{msg['role'].upper()}: {msg['content']}"
-        for msg in transcript
-    )
+    return "\n\n".join(format_message(msg) for msg in transcript)
+
+
+# Transcripts are serialized and written off the event loop, overlapping the
+# disk I/O with the scenarios still talking to the API
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2)
+atexit.register(_SAVE_POOL.shutdown, wait=True)
+
+
+def _write_transcript(path, transcript_data):
+    try:
+        path.write_bytes(json_dumps_bytes(transcript_data))
+    except (OSError, TypeError) as e:
+        print(f"  Warning: could not save {path.name}: {e}", file=sys.stderr)
 
 
 def save_transcript(transcript, scenario_name, score, transcripts_dir):
-    """Save transcript to file for debugging and review."""
+    """Save transcript to file for debugging and review.
+
+    The write happens in the background; the filename is returned at once.
+    """
     transcripts_dir = Path(transcripts_dir)
     transcripts_dir.mkdir(parents=True, exist_ok=True)
 
+    # Scenarios finish concurrently, so the second-resolution timestamp alone
+    # can collide (same scenario name, parallel runs); add a random suffix
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{scenario_name}_score{score}.json"
+    filename = f"{timestamp}_{scenario_name}_score{score}_{uuid4().hex[:8]}.json"
 
     transcript_data = {
         "scenario": scenario_name,
@@ -386,9 +912,7 @@ def save_transcript(transcript, scenario_name, score, transcripts_dir):
         "transcript": transcript
     }
 
-    (transcripts_dir / filename).write_text(
-        json.dumps(transcript_data, indent=2)
-    )
+    _SAVE_POOL.submit(_write_transcript, transcripts_dir / filename, transcript_data)
     return filename
 
 
@@ -396,49 +920,85 @@ def save_transcript(transcript, scenario_name, score, transcripts_dir):
 # MAIN EVALUATION LOOP
 # =============================================================================
 
+async def run_and_grade(scenario, transcripts_dir):
+    """Run one scenario, grade and save its transcript.
+
+    Returns the score, or None if the scenario was lost to a transient API
+    error.
+    """
+    try:
+        print(f"Running scenario: {scenario['name']}", file=sys.stderr)
+
+        # Run multi-turn conversation
+        transcript = await run_scenario(SYSTEM_PROMPT, scenario)
+
+        # Grade the transcript
+        score = await grade_transcript(transcript, scenario["expected_behaviors"])
+
+        # Save for debugging
+        filename = save_transcript(
+            transcript, scenario["name"], score, transcripts_dir
+        )
+        print(f"  {scenario['name']} score: {score}/5 (saved: {filename})",
+              file=sys.stderr)
+        return score
+
+    except Exception as e:
+        if is_config_error(e):
+            raise
+        return failure_score(f"scenario {scenario['name']}", e)
+
+
+async def run_all_scenarios(scenarios, transcripts_dir):
+    """Run and grade all scenarios concurrently.
+
+    Turns within a scenario are sequential, but different scenarios are
+    independent, so wall clock scales with the longest conversation rather
+    than the sum of all of them. chat_async() bounds the requests in flight.
+    """
+    reset_async_state()
+    try:
+        return await asyncio.gather(*(
+            run_and_grade(scenario, transcripts_dir) for scenario in scenarios
+        ))
+    finally:
+        await close_async_state()
+
+
 if __name__ == "__main__":
     if not TRAINING_SCENARIOS or "TODO" in str(TRAINING_SCENARIOS[0].get("name", "")):
         print("Error: TRAINING_SCENARIOS not configured. Edit this file.")
         print("skill_quality: 0.00")
         exit(1)
 
+    transcripts_dir = SCRIPT_DIR / "transcripts"
+
     # Validate models before running any scenarios
     print("Validating model availability...", file=sys.stderr)
-    if not validate_models():
+    if not validate_models(transcripts_dir / ".models_ok"):
         print("Error: One or more models are not available. Fix the model "
               "configuration at the top of this file.", file=sys.stderr)
         print("skill_quality: 0.00")
         exit(1)
 
-    transcripts_dir = SCRIPT_DIR / "transcripts"
-
-    total_score = 0.0
-    scenario_count = 0
-
-    for i, scenario in enumerate(TRAINING_SCENARIOS):
-        try:
-            print(f"Running scenario: {scenario['name']}", file=sys.stderr)
-
-            # Run multi-turn conversation
-            transcript = run_scenario(optimized, scenario)
-
-            # Grade the transcript
-            score = grade_transcript(transcript, scenario["expected_behaviors"])
-
-            # Save for debugging
-            filename = save_transcript(
-                transcript, scenario["name"], score, transcripts_dir
-            )
-            print(f"  Score: {score}/5 (saved: {filename})", file=sys.stderr)
-
-            total_score += score
-            scenario_count += 1
-
-        except Exception as e:
-            print(f"  Error in scenario {scenario['name']}: {e}", file=sys.stderr)
-            total_score += 1.0  # Penalize failures
-            scenario_count += 1
+    try:
+        scores = asyncio.run(run_all_scenarios(TRAINING_SCENARIOS, transcripts_dir))
+    except Exception as e:
+        if not is_config_error(e):
+            raise
+        # The key or a model stopped working since validation was cached
+        (transcripts_dir / ".models_ok").unlink(missing_ok=True)
+        print(f"Error: model configuration rejected by the API: {e}. Fix the "
+              "model configuration at the top of this file.", file=sys.stderr)
+        print("skill_quality: 0.00")
+        exit(1)
+    lost = scores.count(None)
+    if lost:
+        # No metric line: a partial average would not be comparable
+        print(f"Error: {lost} of {len(scores)} scenarios lost to API errors; "
+              "no score reported, re-run this step", file=sys.stderr)
+        exit(1)
 
     # Final metric for Weco
-    avg_score = total_score / scenario_count if scenario_count > 0 else 0.0
+    avg_score = sum(scores) / len(scores)
     print(f"skill_quality: {avg_score:.2f}")
@@ -6,34 +6,105 @@ metric in the format: metric_name: value (e.g., "speedup: 2.50")
 Constraint violations (correctness, memory limits, etc.) should be printed as
 regular messages - Weco will see them and avoid solutions that violate constraints.
 """
-import time
+import timeit
 import importlib.util
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
 
 
 def load_module(path):
-    spec = importlib.util.spec_from_file_location("mod", path)
+    """Import a file as a module named after its stem (e.g. "optimize").
+
+    Registering it in sys.modules lets pickle and dataclasses resolve objects
+    defined in the file. The source loader reuses __pycache__ bytecode, so an
+    unchanged file is not re-parsed on later Weco steps.
+    """
+    name = Path(path).stem
+    spec = importlib.util.spec_from_file_location(name, path)
     mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
     spec.loader.exec_module(mod)
     return mod
 
 
-def benchmark(func, inputs, n_warmup=10, n_iterations=100):
-    """Benchmark a function with warmup iterations."""
+def benchmark(func, inputs, n_warmup=10, n_iterations=None, n_repeats=5):
+    """Benchmark a function with warmup iterations. Returns seconds per call.
+
+    By default timeit's autorange() picks the iteration count per sample (at
+    least 0.2 s), so fast functions run enough times to swamp loop and timer
+    overhead. n_repeats samples are then timed and the median is reported,
+    so even a function slower than 0.2 s is measured several times.
+
+    timeit disables garbage collection while timing; it is re-enabled here
+    so that reducing allocations and GC pressure counts as a speedup.
+    """
+    f, args = func, inputs
     # Warmup
     for _ in range(n_warmup):
-        func(*inputs)
+        f(*args)
     # Measure
-    start = time.perf_counter()
-    for _ in range(n_iterations):
-        func(*inputs)
-    return (time.perf_counter() - start) / n_iterations
+    timer = timeit.Timer(lambda: f(*args), setup="gc.enable()")
+    if n_iterations is None:
+        n_iterations, _ = timer.autorange()
+    samples = timer.repeat(repeat=n_repeats, number=n_iterations)
+    return statistics.median(samples) / n_iterations
+
+
+def make_inputs():
+    """Build the test inputs. Called once; the benchmark subprocesses receive
+    a pickled copy, so the inputs must be picklable."""
+    # TODO: Define test inputs for your function. Seed any randomness
+    # (e.g. random.Random(0), np.random.default_rng(0)) so every Weco step
+    # is timed on the same data.
+    return ()
+
+
+def benchmark_in_subprocess(path, inputs_path):
+    """Benchmark a module's TARGET_FUNCTION in a fresh interpreter.
+
+    Baseline and optimized each get their own process, so neither one's
+    warmup leaves caches, allocator state or JIT/lazy-init work behind for
+    the other. Both load the same pickled inputs from inputs_path. Returns
+    seconds per call.
+    """
+    env = dict(os.environ)
+    # Optional: one BLAS/OpenMP thread for lower noise. Leave unset if the
+    # optimization may legitimately use multiple threads.
+    # env["OMP_NUM_THREADS"] = "1"
+    result = subprocess.run(
+        [sys.executable, __file__, "--bench", path, inputs_path],
+        stdout=subprocess.PIPE, text=True, check=True, env=env,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+if len(sys.argv) == 4 and sys.argv[1] == "--bench":
+    # Benchmark subprocess: time one module on the parent's inputs and print
+    # seconds per call
+    # Optional: pin to one CPU to reduce scheduling noise (Linux only). Same
+    # caveat as OMP_NUM_THREADS above.
+    # os.sched_setaffinity(0, {0})
+    # TODO: Replace TARGET_FUNCTION with your actual function name
+    module = load_module(sys.argv[2])
+    with open(sys.argv[3], "rb") as f:
+        inputs = pickle.load(f)
+    print(benchmark(module.TARGET_FUNCTION, inputs))
+    sys.exit(0)
 
 
 baseline = load_module(".weco/baseline.py")
 optimized = load_module(".weco/optimize.py")
 
-# TODO: Define test inputs for your function
-test_inputs = ()
+test_inputs = make_inputs()
+
+# Snapshot the inputs before the correctness check can mutate them; both
+# benchmark subprocesses time exactly this data
+inputs_snapshot = pickle.dumps(test_inputs)
 
 # =============================================================================
 # CORRECTNESS CHECK (constraint - print violations, don't use as metric)
@@ -50,8 +121,13 @@ if baseline_result != optimized_result:  # or use: abs(baseline_result - optimiz
 # =============================================================================
 # PERFORMANCE MEASUREMENT (the single metric to optimize)
 # =============================================================================
-baseline_time = benchmark(baseline.TARGET_FUNCTION, test_inputs)
-optimized_time = benchmark(optimized.TARGET_FUNCTION, test_inputs)
+with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as inputs_file:
+    inputs_file.write(inputs_snapshot)
+try:
+    baseline_time = benchmark_in_subprocess(".weco/baseline.py", inputs_file.name)
+    optimized_time = benchmark_in_subprocess(".weco/optimize.py", inputs_file.name)
+finally:
+    os.unlink(inputs_file.name)
 
 speedup = baseline_time / optimized_time
 print(f"speedup: {speedup:.4f}")
@@ -9,15 +9,28 @@ regular messages - Weco will see them and avoid solutions that violate constrain
 import time
 import os
 import importlib.util
+import sys
+from pathlib import Path
 
 
 def load_module(path):
-    spec = importlib.util.spec_from_file_location("mod", path)
+    """Import a file as a module named after its stem (e.g. "optimize").
+
+    Registering it in sys.modules lets pickle and dataclasses resolve objects
+    defined in the file. The source loader reuses __pycache__ bytecode, so an
+    unchanged file is not re-parsed on later Weco steps.
+    """
+    name = Path(path).stem
+    spec = importlib.util.spec_from_file_location(name, path)
     mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
     spec.loader.exec_module(mod)
     return mod
 
 
+# Loading the module runs its top-level imports (torch, sklearn, ...) here,
+# before the timer starts, so import cost is not part of training_time.
+# Imports placed inside train_model() are timed.
 optimized = load_module(".weco/optimize.py")
 
 # =============================================================================